@@ -17,26 +17,76 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 ##########################################################################################
+from functools import cache
 from json import JSONDecodeError, dumps, load
-
-import requests
+from typing import TYPE_CHECKING
 
 from jellybench_py.constant import Style
-from jellybench_py.util import styled
+from jellybench_py.util import exit_with_prompt, styled
+
+if TYPE_CHECKING:
+    import requests
+
+# (connect, read) timeouts in seconds for every server request
+_TIMEOUT = (3.05, 30)
+
+
+@cache
+def _get_session() -> "requests.Session":
+    # One shared session so consecutive calls to the server reuse the same connection,
+    # created (and requests imported) on first use so importing this module stays cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    class BoundedRetry(Retry):
+        # Honour Retry-After, but never wait longer than backoff_max for a single retry
+        def get_retry_after(self, response) -> float | None:
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                return None
+            return min(retry_after, self.backoff_max)
+
+    # Retry rate limits and transient server errors with jittered exponential backoff.
+    # A Retry-After header sent by the server takes precedence over the backoff,
+    # capped at backoff_max like the backoff itself.
+    # POST is not retried, so a submission is never uploaded twice.
+    retry = BoundedRetry(
+        total=3,
+        backoff_factor=0.3,
+        backoff_max=30,
+        backoff_jitter=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 def getPlatform(server_url: str) -> list:
+    import requests
+
     print("| Fetch Supported Platforms...", end="")
     platforms = None
-    response = requests.get(f"{server_url}/api/v1/TestDataApi/Platforms")
+    try:
+        response = _get_session().get(
+            f"{server_url}/api/v1/TestDataApi/Platforms", timeout=_TIMEOUT
+        )
+    except requests.RequestException as error:  # unreachable server or timeout
+        print(" Error")
+        print(f"ERROR: Request to the server failed ({error})")
+        exit_with_prompt()
     if response.status_code == 200:
         print(" success!")
         platforms = response.json()
     else:
         print(" Error")
         print(f"ERROR: Server replied with {response.status_code}")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
     platforms = platforms["platforms"]
     return platforms
 
@@ -61,31 +111,46 @@ def getTestData(platformID: str, platforms_data: list, server_url: str) -> tuple
                     [Style.RED, Style.BOLD],
                 )
             )
-            input("Press any key to exit")
-            exit()
+            exit_with_prompt()
         return False, None
 
-    current_platform = None
-    for platform in platforms_data:
-        if platform["id"] == platformID and platform["supported"]:
-            current_platform = platform["id"]
+    current_platform = next(
+        (
+            platform["id"]
+            for platform in platforms_data
+            if platform["id"] == platformID and platform["supported"]
+        ),
+        None,
+    )
     if not current_platform:
         print(" Error")
         print("ERROR: Your Platform isnt Supported.")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
 
-    response = requests.get(
-        f"{server_url}/api/v1/TestDataApi?platformId={current_platform}"
-    )
+    import requests
+
+    try:
+        response = _get_session().get(
+            f"{server_url}/api/v1/TestDataApi?platformId={current_platform}",
+            timeout=_TIMEOUT,
+        )
+    except requests.RequestException as error:  # unreachable server or timeout
+        print(" Error")
+        print(
+            styled(
+                f"ERROR: Request to the server failed ({error})",
+                [Style.RED, Style.BOLD],
+            )
+        )
+        exit_with_prompt()
     if response.status_code == 200:
         print(" success!")
         test_data = response.json()
     elif response.status_code == 429:
         print(" Error")
         print(f"ERROR: Server replied with {response.status_code}")
-        ratelimit_time = response.headers["retry-after"]
-        print(f"Ratelimited: Retry in {ratelimit_time}s")
+        ratelimit_time = response.headers.get("retry-after", "?")
+        print(f"Ratelimited: Retries exhausted, try again in {ratelimit_time}s")
         exit(1)
     else:
         print(" Error")
@@ -95,35 +160,52 @@ def getTestData(platformID: str, platforms_data: list, server_url: str) -> tuple
                 [Style.RED, Style.BOLD],
             )
         )
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
     return valid, test_data
 
 
-def upload(server_url: str, data: dict):
+def upload(server_url: str, data: dict, debug: bool = False):
+    import requests
+
     api_url = f"{server_url}/api/v1/SubmissionApi"
     print(f"| Uploading to {server_url}... ", end="")
 
     headers = {"accept": "text/plain", "Content-Type": "application/json"}
 
-    response = requests.post(api_url, json=data, headers=headers)
+    # Compact encoding: the server does not need the whitespace requests would add
+    body = dumps(data, separators=(",", ":"), allow_nan=False).encode()
+    try:
+        response = _get_session().post(
+            api_url, data=body, headers=headers, timeout=_TIMEOUT
+        )
+    except requests.RequestException as error:  # unreachable server or timeout
+        print(" Error")
+        print(f"ERROR: Request to the server failed ({error})")
+        print()
+        return
     if response.ok:
         print(" success!")
     else:
         print(" Error")
+        print(f"ERROR: Server replied with {response.status_code} ({response.reason})")
     print()
 
+    # Only dump the full response in debug mode
+    if not debug:
+        return
+
     # Display detailed information about the response
     print("\n--- Response Details ---")
     print(f"URL: {response.url}")
     print(f"Status Code: {response.status_code}")
     print(f"Reason: {response.reason}")
-    print(f"Headers: {dumps(dict(response.headers), indent=4)}")
+    print("Headers:")
+    print("\n".join(f"    {key}: {value}" for key, value in response.headers.items()))
     print(f"Elapsed Time: {response.elapsed}")
 
-    # Display the raw response content
-    print("\n--- Raw Response Content ---")
-    print(response.content)
+    # Display a preview of the raw response content, the full body follows below
+    print("\n--- Raw Response Content (first 1 KiB) ---")
+    print(response.content[:1024])
 
     # Display the text response (decoded from bytes)
     print("\n--- Text Response Content ---")
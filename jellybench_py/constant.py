@@ -1,8 +1,7 @@
 from dataclasses import dataclass
-from enum import Enum
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommandConfig:
     BASE_CMD: str
     WORKER_CMD: str
@@ -20,9 +19,20 @@ class Constants:
         WORKER_CMD="-vf hwupload -c:a copy -c:v h264_nvenc -b:v {bitrate} -f null -",
     )
     MAXINT32 = 2147483647
+    # NvEnc session limit by driver version: NVENC_SESSION_LIMITS[0] below the first
+    # version, NVENC_SESSION_LIMITS[i + 1] from NVENC_LIMIT_VERSIONS[i] on
+    NVENC_LIMIT_VERSIONS = (530.0, 550.0)
+    NVENC_SESSION_LIMITS = (3, 5, 8)
+    # ffmpeg failure reasons that mean NvEnc refused a session beyond the driver limit
+    NVENC_LIMIT_REASONS = frozenset({"incompatible client key", "out of memory"})
+    DOWNLOAD_CHUNK_SIZE: int = 1 << 20  # 1 MiB per network read
+    HASH_BLOCK_SIZE: int = 1 << 18  # 256 KiB per update when hashing a mapped file
+    MMAP_HASH_MIN_SIZE: int = 16 << 20  # memory-map files of 16 MiB and up to hash them
+    MAX_PARALLEL_DOWNLOADS: int = 4  # test files downloaded at the same time
 
 
-class Style(Enum):
+class Style:
+    # Plain ANSI escape strings, usable without an Enum .value lookup
     RED: str = "\033[31m"
     GREEN: str = "\033[32m"
     YELLOW: str = "\033[33m"
@@ -18,71 +18,260 @@
 #
 ##########################################################################################
 import argparse
+import hashlib
 import json
+import mmap
 import os
+import posixpath
+import shlex
+import tarfile
 import textwrap
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from functools import cache
 from hashlib import sha256
 from math import ceil, floor
-from shutil import get_terminal_size, rmtree, unpack_archive
-
-import progressbar
-import requests
+from shutil import copyfileobj, get_terminal_size, rmtree
+from time import monotonic
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
 from jellybench_py import api, ffmpeg_log, hwi, worker
 from jellybench_py.constant import Constants, Style
-from jellybench_py.util import confirm, get_nvenc_session_limit, print_debug, styled
+from jellybench_py.util import (
+    confirm,
+    exit_with_prompt,
+    get_nvenc_session_limit,
+    preload_file,
+    print_debug,
+    styled,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+_SUPPORTED_HASHES = frozenset({"sha256"})  # currently supported hashing methods
+_SYSTEM = hwi.platform.system().lower()  # the OS doesn't change while we run
+
+
+@cache
+def _get_download_session() -> "requests.Session":
+    # Shared session so consecutive downloads from the same host reuse the connection
+    # requests is imported on first use, --help doesn't need the whole HTTP stack
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # One pooled connection per concurrent download, connection errors are retried
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=Constants.MAX_PARALLEL_DOWNLOADS,
+        max_retries=3,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def calculate_sha256(file_path: str) -> str:
+    # Calculate SHA256 checksum of a file
+    block_size = Constants.HASH_BLOCK_SIZE
+    with open(file_path, "rb", buffering=0) as f:
+        # Mapping only pays off for large files, small ones are simply read
+        if os.fstat(f.fileno()).st_size >= Constants.MMAP_HASH_MIN_SIZE:
+            try:
+                # Hash straight out of the page cache, without copying into a buffer
+                sha256_hash = sha256()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):  # aggressive readahead
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    with memoryview(mapped) as view:
+                        for offset in range(0, len(view), block_size):
+                            sha256_hash.update(view[offset : offset + block_size])
+                return sha256_hash.hexdigest()
+            except (OSError, ValueError):
+                pass  # unmappable file (e.g. >2GB on 32-bit), read it instead
+
+        return hashlib.file_digest(f, "sha256").hexdigest()  # reads and hashes in C
+
+
+def write_checksum_sidecar(file_path: str, checksum: str) -> None:
+    # Store "<sha256> <mtime_ns> <size>" next to the file, replaced atomically
+    stat = os.stat(file_path)
+    sidecar_path = f"{file_path}.sha256"
+    try:
+        with open(f"{sidecar_path}.tmp", "w") as sidecar:
+            sidecar.write(f"{checksum} {stat.st_mtime_ns} {stat.st_size}\n")
+        os.replace(f"{sidecar_path}.tmp", sidecar_path)
+    except OSError:
+        pass  # the cache is only an optimization
 
 
-def obtainSource(
-    target_path: str, source_url: str, hash_dict: dict, name: str, quiet: bool
-) -> tuple:
-    def match_hash(hash_dict: dict) -> tuple:
-        supported_hashes = [
-            "sha256",
-        ]  # list of currently supported hashing methods
-        message = ""
+def cached_sha256(file_path: str) -> str:
+    # Reuse the stored checksum while the file's size and mtime are unchanged
+    stat = os.stat(file_path)
+    try:
+        with open(f"{file_path}.sha256", "r") as sidecar:
+            checksum, mtime_ns, size = sidecar.read().split()
+        if int(mtime_ns) == stat.st_mtime_ns and int(size) == stat.st_size:
+            return checksum
+    except (OSError, ValueError):
+        pass  # missing or malformed sidecar, hash the file
+    checksum = calculate_sha256(file_path)
+    write_checksum_sidecar(file_path, checksum)
+    return checksum
+
+
+def prehash_files(file_paths: list) -> dict:
+    # Hash already present files concurrently, one per core
+    # Threads are enough here, hashlib releases the GIL while hashing
+    existing = [path for path in file_paths if os.path.isfile(path)]
+    if not existing:
+        return {}
+    workers = min(os.cpu_count() or 1, len(existing))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(existing, executor.map(cached_sha256, existing)))
+
+
+def match_hash(hash_dict: dict, quiet: bool) -> tuple:
+    # Pick the first supported hash, returns (algorithm, hash, message)
+    # The message is only shown when not quiet, don't build it otherwise
+    hash = next(
+        (hash for hash in hash_dict or () if hash["type"] in _SUPPORTED_HASHES),
+        None,
+    )
+    if hash is not None:
+        message = (
+            ""
+            if quiet
+            else f"Note: Compatible hashing method found. Using {hash['type']}"
+        )
+        return hash["type"], hash["hash"].lower(), message
+
+    message = ""
+    if not quiet:
         if not hash_dict:
             message = "Note: " + styled("No file hash provided!", [Style.YELLOW])
-            return None, None, message
-
-        for idx, hash in enumerate(hash_dict):
-            if hash["type"] in supported_hashes:
-                message = f"Note: Compatible hashing method found. Using {hash['type']}"
-                return hash["type"], hash["hash"].lower(), message
-        message = "Note: " + styled(
-            "No compatible hashing method found.", [Style.YELLOW]
-        )
-        return None, None, message
+        else:
+            message = "Note: " + styled(
+                "No compatible hashing method found.", [Style.YELLOW]
+            )
+    return None, None, message
+
+
+def source_file_path(target_path: str, source_url: str) -> str:
+    # Where obtainSource keeps the file downloaded from source_url
+    return os.path.join(target_path, posixpath.basename(source_url))
+
+
+def check_source(
+    file_path: str, hash_dict: dict, known_checksums: dict | None = None
+) -> bool:
+    # Whether an already present file can be used as is instead of downloading it
+    if not os.path.exists(file_path):
+        return False
+    hash_algorithm, source_hash, _ = match_hash(hash_dict, quiet=True)
+    existing_checksum = None
+    if hash_algorithm == "sha256":
+        if known_checksums and file_path in known_checksums:
+            existing_checksum = known_checksums[file_path]  # already hashed
+        else:
+            existing_checksum = cached_sha256(file_path)  # checksum validation
+
+    if args.debug_flag and args.ignore_hash:
+        print_debug("> Existing file hash:")
+        print_debug(f"> > {hash_algorithm}: {existing_checksum}")
+
+    if existing_checksum == source_hash or source_hash is None:  # if valid/no sum
+        if args.debug_flag and args.ignore_hash:
+            if source_hash:
+                print_debug(
+                    "> Existing file hash matches server provided hash, skipping download."
+                )
+            else:
+                print_debug("> No Server provided hash, skipping download.")
+        return True
+    elif args.ignore_hash:
+        print_debug("> Ignoring hash mismatch, using existing file.")
+        return True
+    else:
+        if args.debug_flag:
+            print_debug(
+                "> Existing file hash does not match server provided hash. Downloading new file"
+            )
+        return False
+
+
+class DownloadAborted(Exception):
+    # Raised inside a running download once its abort event is set
+    pass
 
-    def calculate_sha256(file_path: str) -> str:
-        # Calculate SHA256 checksum of a file
-        sha256_hash = sha256()
-        with open(file_path, "rb") as f:
-            # Read and update hash string value in blocks of 4K
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
 
+def obtainSource(
+    target_path: str,
+    source_url: str,
+    hash_dict: dict,
+    name: str,
+    quiet: bool,
+    known_checksums: dict | None = None,
+    show_progress: bool = True,
+    abort: threading.Event | None = None,
+) -> tuple:
     def download_file(url, file_path, filename):
+        # Download the file and hash it on the fly, returns (success, message, sha256)
+        import progressbar
+        import requests
+        import urllib3
+
         label = r'| "{filename}" ({size:.2f}MB)'
+        # Data goes to a .part file first, an interrupted download resumes from there
+        part_path = f"{file_path}.part"
+        offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
         try:
             # Send HTTP request to get the file
-            response = requests.get(url, stream=True)
+            # The files are already compressed, ask for them as they are
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            session = _get_download_session()
+            response = session.get(url, stream=True, headers=headers, timeout=(5, 30))
+
+            # Only append if the server continues exactly where the .part file ends
+            resumed = (
+                response.status_code == 206
+                and response.headers.get("content-range", "").startswith(
+                    f"bytes {offset}-"
+                )
+                and "no-cache" not in response.headers.get("cache-control", "")
+            )
+            if offset and not resumed and response.status_code in (206, 416):
+                response.close()  # start over with the whole file
+                del headers["Range"]
+                response = session.get(
+                    url, stream=True, headers=headers, timeout=(5, 30)
+                )
 
             # If the response status is not successful, return failure
-            if response.status_code != 200:
-                return False, response.status_code  # Unable to download file
+            if response.status_code != 200 and not resumed:
+                return False, response.status_code, None  # Unable to download file
 
-            total_size = int(response.headers.get("content-length", 0))
+            if not resumed:
+                offset = 0
+            total_size = offset + int(response.headers.get("content-length", 0))
 
             # If total_size is 0, assume there was a problem with the file size info
-            if total_size == 0:
-                return False, "Invalid file size"
+            if total_size == offset:
+                return False, "Invalid file size", None
             label = label.format(filename=filename, size=total_size / 1024.0 / 1024)
 
-            with open(file_path, "wb") as file:
-                # Initialize the progress bar
-                total_chunks = ceil(total_size / 1024)
+            if resumed:  # continue the hash from the bytes already on disk
+                with open(part_path, "rb") as part:
+                    file_hash = hashlib.file_digest(part, "sha256")
+            else:
+                file_hash = sha256()
+            with open(part_path, "ab" if resumed else "wb") as file:
+                # Initialize the progress bar, tracking bytes instead of chunks
                 widgets = [
                     f"{label}: ",
                     progressbar.Percentage(),
@@ -92,27 +281,47 @@ def obtainSource(
                     progressbar.ETA(),
                 ]
 
-                with progressbar.ProgressBar(
-                    max_value=total_chunks, widgets=widgets
-                ) as bar:
-                    progress = 0  # Track progress manually
-                    for chunk in response.iter_content(chunk_size=1024):
-                        if chunk:
-                            progress += 1
-                            file.write(chunk)
-                            file.flush()
-                            bar.update(progress)
-
-            return True, ""
-
-        except requests.exceptions.RequestException:
-            return False, "Request error"  # Network issues or invalid URL
-
-    hash_algorithm, source_hash, hash_message = match_hash(hash_dict)
-
-    target_path = os.path.realpath(target_path)  # Relative Path!
-    filename = os.path.basename(source_url)  # Extract filename from the URL
-    file_path = os.path.join(target_path, filename)  # path/filename
+                # Concurrent downloads can't share the terminal, they draw no bar
+                bar_class = (
+                    progressbar.ProgressBar if show_progress else progressbar.NullBar
+                )
+                with bar_class(max_value=total_size, widgets=widgets) as bar:
+                    progress = offset  # Track progress manually
+                    last_update = monotonic()
+                    read_raw = response.raw.read
+
+                    def read(size: int = -1) -> bytes:
+                        # Hash and report each block as copyfileobj pulls it through
+                        nonlocal progress, last_update
+                        if abort is not None and abort.is_set():
+                            raise DownloadAborted
+                        chunk = read_raw(size)
+                        progress += len(chunk)
+                        file_hash.update(chunk)
+                        # Redraw at most every 50ms, independent of chunk size
+                        now = monotonic()
+                        if now - last_update > 0.05:
+                            bar.update(min(progress, total_size))
+                            last_update = now
+                        return chunk
+
+                    response.raw.decode_content = True
+                    reader = SimpleNamespace(read=read)
+                    copyfileobj(reader, file, Constants.DOWNLOAD_CHUNK_SIZE)
+                    bar.update(min(progress, total_size))
+
+            os.replace(part_path, file_path)
+            return True, "", file_hash.hexdigest()
+
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError):
+            return False, "Request error", None  # Network issues or invalid URL
+        except DownloadAborted:
+            return False, "Download aborted", None  # the .part file is kept to resume
+
+    hash_algorithm, source_hash, hash_message = match_hash(hash_dict, quiet)
+
+    target_path = os.path.abspath(target_path)  # cli passes already resolved paths
+    file_path = source_file_path(target_path, source_url)
 
     if args.debug_flag:
         print()
@@ -122,46 +331,32 @@ def obtainSource(
             for idx, item in enumerate(hash_dict):
                 print_debug(f"> > {item['type']}: {item['hash']}")
 
-    if os.path.exists(file_path):  # if file already exists
-        existing_checksum = None
-        if hash_algorithm == "sha256":
-            existing_checksum = calculate_sha256(file_path)  # checksum validation
-
-        if args.debug_flag and args.ignore_hash:
-            print_debug("> Existing file hash:")
-            print_debug(f"> > {hash_algorithm}: {existing_checksum}")
-
-        if existing_checksum == source_hash or source_hash is None:  # if valid/no sum
-            if args.debug_flag and args.ignore_hash:
-                if source_hash:
-                    print_debug(
-                        "> Existing file hash matches server provided hash, skipping download."
-                    )
-                else:
-                    print_debug("> No Server provided hash, skipping download.")
-            print(" success!")
-            if not quiet:
-                print(hash_message)
-            return True, file_path  # Checksum valid, no need to download again
-        elif args.ignore_hash:
-            print_debug("> Ignoring hash mismatch, using existing file.")
-            return True, file_path
-        else:
-            if args.debug_flag:
-                print_debug(
-                    "> Existing file hash does not match server provided hash. Downloading new file"
-                )
-            os.remove(file_path)  # Delete file if checksum doesn't match
+    if check_source(file_path, hash_dict, known_checksums):
+        print(" success!")
+        if not quiet:
+            print(hash_message)
+        return True, file_path  # Checksum valid, no need to download again
+    if os.path.exists(file_path):
+        os.remove(file_path)  # Delete file if checksum doesn't match
 
     # Create target path if non present
-    if not os.path.exists(target_path):
-        os.makedirs(target_path)
+    os.makedirs(target_path, exist_ok=True)
 
-    success, message = download_file(source_url, file_path, name)
+    # checksum is computed while downloading, no need to read the file again
+    resuming = os.path.isfile(f"{file_path}.part")
+    success, message, downloaded_checksum = download_file(source_url, file_path, name)
+    if success and resuming and source_hash not in (None, downloaded_checksum):
+        # The resumed part may stem from an older version of the file, start over once
+        if args.debug_flag:
+            print_debug("> Checksum of resumed download failed, downloading it again")
+        os.remove(file_path)
+        success, message, downloaded_checksum = download_file(
+            source_url, file_path, name
+        )
     if not success:
-        return success, file_path
+        return success, message
+    write_checksum_sidecar(file_path, downloaded_checksum)
 
-    downloaded_checksum = calculate_sha256(file_path)  # checksum validation
     # print(f"CHECKSUM: {downloaded_checksum}")
     if downloaded_checksum == source_hash or source_hash is None:  # if valid/no sum
         if args.debug_flag and args.ignore_hash:
@@ -185,28 +380,106 @@ def obtainSource(
 
 
 def unpackArchive(archive_path, target_path):
+    # The marker lists the archive checksum and every file unpacked from it
+    marker_path = os.path.join(target_path, ".archive.sha256")
+    archive_checksum = cached_sha256(archive_path)  # stored when it was verified
+    try:
+        with open(marker_path, "r") as marker:
+            unpacked_checksum, *unpacked_files = marker.read().splitlines()
+        if unpacked_checksum == archive_checksum and all(
+            os.path.isfile(os.path.join(target_path, name)) for name in unpacked_files
+        ):
+            print("Unpacking Archive... already unpacked!")
+            return
+    except (OSError, ValueError):
+        pass  # never unpacked or unreadable marker, unpack again
+
     if os.path.exists(target_path):
         rmtree(target_path)
         print(
             "INFO: "
             + styled("Replacing existing files with validated ones.", [Style.CYAN])
         )
-    os.makedirs(target_path)
+    os.makedirs(target_path, exist_ok=True)
 
     print("Unpacking Archive...", end="")
-    if archive_path.endswith((".zip", ".tar.gz", ".tar.xz")):
-        unpack_archive(archive_path, target_path)
+    buffer_size = Constants.DOWNLOAD_CHUNK_SIZE
+    if archive_path.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                name = member.filename
+                # Same safety rule as shutil.unpack_archive: stay inside target_path
+                if name.startswith("/") or ".." in name.split("/"):
+                    continue
+                member_path = os.path.join(target_path, *name.split("/"))
+                if member.is_dir():
+                    os.makedirs(member_path, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(member_path), exist_ok=True)
+                if member.file_size == 0:  # nothing to decompress, just create it
+                    open(member_path, "wb").close()
+                    continue
+                with archive.open(member) as src, open(member_path, "wb") as dst:
+                    copyfileobj(src, dst, buffer_size)
+    elif archive_path.endswith((".tar.gz", ".tar.xz")):
+        with tarfile.open(archive_path, "r:*") as archive:
+            archive.copybufsize = buffer_size
+            if hasattr(tarfile, "data_filter"):  # Python 3.11.4+
+                archive.extractall(target_path, filter="data")
+            else:
+                archive.extractall(target_path)
+
+    unpacked_files = [
+        os.path.relpath(os.path.join(root, name), target_path)
+        for root, _, names in os.walk(target_path)
+        for name in names
+    ]
+    with open(marker_path, "w") as marker:
+        marker.write("\n".join([archive_checksum, *unpacked_files]) + "\n")
     print(" success!")
 
 
-def format_gpu_arg(system_os, gpu, gpu_idx):
-    if system_os.lower() == "windows":
+def format_gpu_arg(gpu, gpu_idx, system_os=_SYSTEM):
+    if system_os == "windows":
         return gpu_idx
-    if system_os.lower() == "linux":
+    if system_os == "linux":
         return gpu["businfo"].replace("@", "-")
 
 
-def benchmark(ffmpeg_cmd: str, debug_flag: bool, prog_bar, limit=0) -> tuple:
+def next_worker_count(
+    total_workers: int, speed: float, max_pass: int, min_fail: int, limit: int
+) -> tuple:
+    # Scaling policy: worker count for the next run and whether the limit capped it
+    if speed >= 1:  # scale up by the headroom, but always by at least one worker
+        total_workers = max(total_workers + 1, ceil(total_workers * speed))
+    else:  # scale down towards the last passing count
+        total_workers = max(max_pass + 1, floor(total_workers * speed))
+
+    # make sure we don't go into already benchmarked region
+    if total_workers >= min_fail:
+        total_workers = min_fail - 1
+
+    if total_workers <= max_pass:
+        total_workers = max_pass + 1
+
+    # Enforce external limit
+    if limit and total_workers > limit:
+        return limit, True
+    return total_workers, False
+
+
+def run_workers(worker_count: int, ffmpeg_cmd: list, prog_bar) -> tuple:
+    # Run the workers in the background so the progress bar keeps ticking meanwhile
+    if not prog_bar:
+        return worker.workMan(worker_count, ffmpeg_cmd)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(worker.workMan, worker_count, ffmpeg_cmd)
+        while not wait([future], timeout=1).done:
+            prog_bar.update()
+        return future.result()
+
+
+def benchmark(ffmpeg_cmd: list, debug_flag: bool, prog_bar, limit=0) -> tuple:
     # Blake Approved Wording
     # Test: One set of transcode parameters for a given file
     # Run: One iteration of the loop in this function
@@ -225,8 +498,8 @@ def benchmark(ffmpeg_cmd: str, debug_flag: bool, prog_bar, limit=0) -> tuple:
         False  # Flag to save if run is being limited by external factors (eg. driver)
     )
     if debug_flag:
-        print_debug(f"> > > ffmpeg command: {ffmpeg_cmd}")
-        
+        print_debug(f"> > > ffmpeg command: {shlex.join(ffmpeg_cmd)}")
+
     while run:
         assert max_pass < min_fail
 
@@ -244,59 +517,40 @@ def benchmark(ffmpeg_cmd: str, debug_flag: bool, prog_bar, limit=0) -> tuple:
                 speed=f"{last_speed:.02f}",
             )
 
-        output = worker.workMan(total_workers, ffmpeg_cmd)
-
-        # output[0] boolean, Errored, False = no Errors, True = Errored
-        # output[1] Run data if no errors, Error reason if errored
+        failed, run_data = run_workers(total_workers, ffmpeg_cmd, prog_bar)
+        # run_data holds the evaluated run, or the failure reason if a worker errored
 
-        # First check if we continue Running:
         # Stop if errored
-        if output[0]:
-            if args.debug_flag:
-                print(f"failed with reason {output[1]}")
-            failure_reason.append(output[1])
+        if failed:
+            if debug_flag:
+                print(f"failed with reason {run_data}")
+            failure_reason.append(run_data)
             break
 
-        # exactly or faster than real time for this run
-
-        elif output[1]["speed"] >= 1:
+        speed = run_data["speed"]
+        if speed >= 1:  # exactly or faster than real time for this run
             max_pass = total_workers
-            max_pass_run_data = output[1]
-
-            if output[1]["speed"] > 1:
-                total_workers = ceil(total_workers * output[1]["speed"])
-            else:
-                total_workers += 1
+            max_pass_run_data = run_data
 
             # if limited end run
             if external_limited:
                 run = False
-
-        # slower than real time for this run
-        elif output[1]["speed"] < 1:
+        else:  # slower than real time for this run
             min_fail = total_workers
-            total_workers *= floor(total_workers * output[1]["speed"])
-
-        if args.debug_flag:
-            print(f'completed with speed {output[1]["speed"]:.02f}')
 
-        # make sure we don't go into already benchmarked region
-        if total_workers >= min_fail:
-            total_workers = min_fail - 1
-
-        if total_workers <= max_pass:
-            total_workers = max_pass + 1
+        if debug_flag:
+            print(f"completed with speed {speed:.02f}")
 
-        # Enforce external limit
-        if limit and total_workers > limit:
-            total_workers = limit
-            external_limited = True
+        total_workers, limited = next_worker_count(
+            total_workers, speed, max_pass, min_fail, limit
+        )
+        external_limited = external_limited or limited
 
         if min_fail - max_pass == 1:
             run = False
 
-        runs.append(output[1])
-        last_speed = output[1]["speed"]
+        runs.append(run_data)
+        last_speed = speed
 
     # Process results
 
@@ -338,25 +592,19 @@ def benchmark(ffmpeg_cmd: str, debug_flag: bool, prog_bar, limit=0) -> tuple:
 
 
 def check_driver_limit(device: dict, ffmpeg_binary: str, gpu_idx: int):
-    def build_test_cmd(worker_ammount: int, ffmpeg_binary: str, gpu_arg) -> str:
-        # Build an ffmpeg command to test {n}-concurrent NvEnc Streams
-        if hwi.platform.system().lower() == "windows":
-            base_cmd = Constants.NVENC_TEST_WINDOWS.BASE_CMD.format(
-                ffmpeg=ffmpeg_binary, gpu=gpu_arg
-            )
-            worker_base = Constants.NVENC_TEST_WINDOWS.WORKER_CMD
+    def build_test_cmds(worker_ammount: int, ffmpeg_binary: str, gpu_arg) -> list:
+        # Build one ffmpeg command per NvEnc stream, each run as its own session
+        if _SYSTEM == "windows":
+            config = Constants.NVENC_TEST_WINDOWS
         else:
-            base_cmd = Constants.NVENC_TEST_LINUX.BASE_CMD.format(
-                ffmpeg=ffmpeg_binary, gpu=gpu_arg
-            )
-            worker_base = Constants.NVENC_TEST_LINUX.WORKER_CMD
-        worker_commands = []
-        for i in range(1, worker_ammount + 1):
-            bitrate = f"{i}M"
-            worker_command = worker_base.format(bitrate=bitrate)
-            worker_commands.append(worker_command)
-        full_command = base_cmd + " ".join(worker_commands)
-        return full_command
+            config = Constants.NVENC_TEST_LINUX
+        base_cmd = config.BASE_CMD.format(ffmpeg=ffmpeg_binary, gpu=gpu_arg)
+        # Split the worker template once, only the bitrate differs per worker
+        head, _, tail = config.WORKER_CMD.partition("{bitrate}")
+        return [
+            shlex.split(f"{base_cmd}{head}{i}M{tail}")
+            for i in range(1, worker_ammount + 1)
+        ]
 
     def parse_driver(driver_raw: str) -> int:
         # parse windows specific driver output into NVIDIA Version (e.g. 32.0.15.6603 --> 566.03)
@@ -364,11 +612,9 @@ def check_driver_limit(device: dict, ffmpeg_binary: str, gpu_idx: int):
         if len(split_driver) != 4:
             return -1
 
-        major_version = list(split_driver[-2])
-        if 0 < len(major_version):
-            major_version = major_version[-1]
-        else:
+        if not split_driver[-2]:
             return -1
+        major_version = split_driver[-2][-1]
         minor_version = split_driver[-1]
 
         if not (major_version.isdigit() and minor_version.isdigit()):
@@ -389,14 +635,31 @@ def check_driver_limit(device: dict, ffmpeg_binary: str, gpu_idx: int):
         if 0 < driver_limit:
             limit = driver_limit
 
-    gpu_arg = format_gpu_arg(hwi.platform.system(), device, gpu_idx)
+    gpu_arg = format_gpu_arg(device, gpu_idx)
     worker_ammount = limit + 1
     print(f"| Testing with {worker_ammount} workers...", end="")
-    command = build_test_cmd(worker_ammount, ffmpeg_binary, gpu_arg)
+    commands = build_test_cmds(worker_ammount, ffmpeg_binary, gpu_arg)
 
     skip_device = False
     limited_driver = 0
-    successful_count, failure_reason = worker.test_command(command)
+    # Start all sessions at once, every process that gets a session succeeds
+    with ThreadPoolExecutor(max_workers=worker_ammount) as executor:
+        results = list(executor.map(worker.run_ffmpeg, range(worker_ammount), commands))
+    successful_count = sum(1 for _, reason in results if reason is None)
+    failure_reason = next((reason for _, reason in results if reason), None)
+    # Only a refused session means the driver limit was hit, any other failure
+    # (timeout, crash, missing device) means NvEnc doesn't work at all
+    unexpected_reason = next(
+        (
+            reason
+            for _, reason in results
+            if reason and reason not in Constants.NVENC_LIMIT_REASONS
+        ),
+        None,
+    )
+    if unexpected_reason is not None:
+        successful_count = 0
+        failure_reason = unexpected_reason
     if successful_count == worker_ammount:
         print(" success!")
 
@@ -427,12 +690,17 @@ def output_json(data, file_path, server_url):
     if file_path:
         # Create the directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # Pretty print only in debug mode, encode in one go and write once
+        if args.debug_flag:
+            serialized = json.dumps(data, indent=4)
+        else:
+            serialized = json.dumps(data, separators=(",", ":"))
         with open(file_path, "w") as json_file:
-            json.dump(data, json_file, indent=4)
+            json_file.write(serialized)
         print(f"Data successfully saved to {file_path}")
     else:
         # upload to server
-        api.upload(server_url, data)
+        api.upload(server_url, data, debug=args.debug_flag)
 
 
 def only_do_upload_flow():
@@ -453,7 +721,7 @@ def only_do_upload_flow():
     except json.JSONDecodeError:
         print("Error: The file is not a valid JSON.")
         exit()
-    api.upload(args.server_url, data)
+    api.upload(args.server_url, data, debug=args.debug_flag)
     exit()
 
 
@@ -543,6 +811,8 @@ def cli() -> None:
     global args
     args = parse_args()
 
+    import progressbar  # only needed once the benchmark actually runs
+
     print()
     print("Welcome to jellybench_py Cheeseburger Edition 🍔")
     print()
@@ -591,8 +861,7 @@ def cli() -> None:
         else:
             print()
             print("ERROR: Invalid Server URL")
-            input("Press any key to exit")
-            exit()
+            exit_with_prompt()
     else:
         if args.server_url != Constants.DEFAULT_SERVER_URL:
             print_debug(
@@ -615,6 +884,16 @@ def cli() -> None:
         if "architecture" in cpu:
             print(f"|     Arch: {cpu['architecture']}")
 
+    if args.debug_flag:
+        import ssl
+
+        # Checksum validation runs through OpenSSL, which uses SHA CPU extensions if present
+        print_debug(f"> Hashing backend: {ssl.OPENSSL_VERSION}")
+        if not hwi.has_sha_extensions():
+            print_debug(
+                "> No SHA CPU extensions detected, checksum validation will be slower"
+            )
+
     print("|   RAM:")
     for ram in system_info["memory"]:
         vendor = ram["vendor"] if "vendor" in ram else "Generic"
@@ -685,8 +964,7 @@ def cli() -> None:
     if args.gpu_input == 0 and args.disable_cpu:
         print()
         print("ERROR: All Hardware Disabled")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
 
     # Stop Hardware Selection logic
 
@@ -697,12 +975,18 @@ def cli() -> None:
     print(styled("Done", [Style.GREEN]))
     print()
 
+    # Resolve and create the download directories once
+    ffmpeg_root = os.path.realpath(args.ffmpeg_path)
+    video_root = os.path.realpath(args.video_path)
+    os.makedirs(ffmpeg_root, exist_ok=True)
+    os.makedirs(video_root, exist_ok=True)
+
     # Download ffmpeg
     ffmpeg_data = server_data["ffmpeg"]
     print(styled("Loading ffmpeg", [Style.BOLD]))
     print('| Searching local "ffmpeg"...', end="")
     ffmpeg_download = obtainSource(
-        args.ffmpeg_path,
+        ffmpeg_root,
         ffmpeg_data["ffmpeg_source_url"],
         ffmpeg_data["ffmpeg_hashs"],
         "ffmpeg",
@@ -711,17 +995,16 @@ def cli() -> None:
 
     if ffmpeg_download[0] is False:
         print(f"An Error occured: {ffmpeg_download[1]}")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
     elif ffmpeg_download[1].endswith((".zip", ".tar.gz", ".tar.xz")):
-        ffmpeg_files = f"{args.ffmpeg_path}/ffmpeg_files"
+        ffmpeg_files = os.path.join(ffmpeg_root, "ffmpeg_files")
         unpackArchive(ffmpeg_download[1], ffmpeg_files)
-        ffmpeg_binary = f"{ffmpeg_files}/ffmpeg"
+        ffmpeg_binary = os.path.join(ffmpeg_files, "ffmpeg")
         if system_info["os"]["id"] == "windows":
             ffmpeg_binary = f"{ffmpeg_binary}.exe"
     else:
         ffmpeg_binary = ffmpeg_download[1]
-    ffmpeg_binary = os.path.abspath(ffmpeg_binary)
+    preload_file(ffmpeg_binary)  # warm the cache before the first ffmpeg spawns
     ffmpeg_binary = ffmpeg_binary.replace("\\", "\\\\")
     print(styled("Done", [Style.GREEN]))
     print()
@@ -729,18 +1012,103 @@ def cli() -> None:
     # Downloading Videos
     files = server_data["tests"]
     print(styled("Obtaining Test-Files:", [Style.BOLD]))
+    # Several tests may share a source file, only obtain each one once
+    unique_files = {}
     for file in files:
+        unique_files.setdefault(file["source_url"], file)
+
+    # Validate the already downloaded files up front, all at once
+    known_checksums = prehash_files(
+        [
+            source_file_path(video_root, file["source_url"])
+            for file in unique_files.values()
+            if match_hash(file["source_hashs"], quiet=True)[0] == "sha256"
+        ]
+    )
+
+    def download_failed(output) -> None:
+        print(" Error")
+        print("")
+        print(f"The following Error occured: {output}")
+        exit_with_prompt()
+
+    # Several missing files are downloaded concurrently below, a single one (or any
+    # in debug mode) goes through the regular path with its own progress bar
+    missing_files = {}
+    if not args.debug_flag:
+        missing_files = {
+            source_url: file
+            for source_url, file in unique_files.items()
+            if not check_source(
+                source_file_path(video_root, source_url),
+                file["source_hashs"],
+                known_checksums,
+            )
+        }
+        if len(missing_files) < 2:
+            missing_files = {}
+
+    video_paths = {}  # source_url -> local file path
+    for source_url, file in unique_files.items():
+        if source_url in missing_files:
+            continue
         name = os.path.basename(file["name"])
         print(f'| "{name}" - local -', end="")
         success, output = obtainSource(
-            args.video_path, file["source_url"], file["source_hashs"], name, quiet=True
+            video_root,
+            source_url,
+            file["source_hashs"],
+            name,
+            quiet=True,
+            known_checksums=known_checksums,
         )
         if not success:
-            print(" Error")
-            print("")
-            print(f"The following Error occured: {output}")
-            input("Press any key to exit")
-            exit()
+            download_failed(output)
+        video_paths[source_url] = output
+
+    if missing_files:
+        print(f"| Downloading {len(missing_files)} file(s)...")
+        workers = min(Constants.MAX_PARALLEL_DOWNLOADS, len(missing_files))
+        abort = threading.Event()  # stops the remaining transfers on failure or Ctrl+C
+        failure = None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    obtainSource,
+                    video_root,
+                    source_url,
+                    file["source_hashs"],
+                    os.path.basename(file["name"]),
+                    quiet=True,
+                    known_checksums=known_checksums,
+                    show_progress=False,
+                    abort=abort,
+                ): source_url
+                for source_url, file in missing_files.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    source_url = futures[future]
+                    print(
+                        f'| "{os.path.basename(missing_files[source_url]["name"])}" -',
+                        end="",
+                    )
+                    success, output = future.result()
+                    if not success:
+                        failure = output
+                        abort.set()
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    print(" downloaded!")
+                    video_paths[source_url] = output
+            except BaseException:
+                # e.g. Ctrl+C, don't wait for the remaining transfers to finish
+                abort.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        # Leaving the with block waits for the aborted transfers to wind down
+        if failure is not None:
+            download_failed(failure)
     print(styled("Done", [Style.GREEN]))
     print()
 
@@ -751,15 +1119,16 @@ def cli() -> None:
         if skip_device:
             supported_types.remove("nvidia")
 
-    # Count ammount of tests required to do:
-    test_arg_count = 0
-    for file in files:
-        tests = file["data"]
-        for test in tests:
-            commands = test["arguments"]
-            for command in commands:
-                if command["type"] in supported_types:
-                    test_arg_count += 1
+    # Collect every (file, test, command) we will run in a single pass
+    supported = frozenset(supported_types)
+    test_plan = [
+        (file, test, command)
+        for file in files
+        for test in file["data"]
+        for command in test["arguments"]
+        if command["type"] in supported
+    ]
+    test_arg_count = len(test_plan)
     print(f"We will do {test_arg_count} tests.")
 
     if not confirm(automate=skip_prompts):
@@ -794,59 +1163,60 @@ def cli() -> None:
     if not args.debug_flag:
         prog_bar = progressbar.ProgressBar(max_value=test_arg_count, widgets=widgets)
 
+    # Invariant for the whole benchmark, the OS and GPU don't change between tests
+    gpu_arg = format_gpu_arg(gpu, gpu_idx) if gpu else ""
+
     progress = 0
-    for file in files:  # File Benchmarking Loop
-        ffmpeg_log.set_test_header(file["name"])
-        if args.debug_flag:
-            print()
-            print_debug(f"Current File: {file['name']}")
-        filename = os.path.basename(file["source_url"])
-        current_file = os.path.abspath(f"{args.video_path}/{filename}")
-        current_file = current_file.replace("\\", "\\\\")
-        tests = file["data"]
-        for test in tests:
+    current_source = None
+    current_test = None
+    for file, test, command in test_plan:  # Benchmarking Loop
+        if file is not current_source:  # next file
+            current_source = file
+            ffmpeg_log.set_test_header(file["name"])
+            if args.debug_flag:
+                print()
+                print_debug(f"Current File: {file['name']}")
+            current_file = video_paths[file["source_url"]].replace("\\", "\\\\")
+            format_context = {"video_file": current_file, "gpu": gpu_arg}
+        if test is not current_test:  # next test
+            current_test = test
             if args.debug_flag:
                 print_debug(
                     f"> > Current Test: {test['from_resolution']} - {test['to_resolution']}"
                 )
-            commands = test["arguments"]
-            for command in commands:
-                test_data = {}
-                if command["type"] in supported_types:
-                    if args.debug_flag:
-                        print_debug(f"> > > Current Device: {command['type']}")
-                    arguments = command["args"]
-                    arguments = arguments.format(
-                        video_file=current_file,
-                        gpu=format_gpu_arg(hwi.platform.system(), gpu, gpu_idx),
-                    )
-                    test_cmd = f"{ffmpeg_binary} {arguments}"
-                    ffmpeg_log.set_test_args(test_cmd)
 
-                    # cap nvidia limit
-                    limit = 0
-                    if command["type"] == "nvidia":
-                        limit = limited_driver
+        test_data = {}
+        if args.debug_flag:
+            print_debug(f"> > > Current Device: {command['type']}")
+        arguments = command["args"].format_map(format_context)
+        test_cmd = f"{ffmpeg_binary} {arguments}"
+        ffmpeg_log.set_test_args(test_cmd)
+
+        # cap nvidia limit
+        limit = 0
+        if command["type"] == "nvidia":
+            limit = limited_driver
+
+        # Split into argv once here, every worker of every run reuses the list
+        valid, runs, result = benchmark(
+            shlex.split(test_cmd), args.debug_flag, prog_bar, limit=limit
+        )
+        if prog_bar:  # only update is progress bar exists
+            progress += 1
+            prog_bar.update(progress)
+        test_data["id"] = test["id"]
+        test_data["type"] = command["type"]
+        if command["type"] != "cpu":
+            test_data["selected_gpu"] = gpu_idx
+            test_data["selected_cpu"] = None
+        else:
+            test_data["selected_gpu"] = None
+            test_data["selected_cpu"] = 0
+        test_data["runs"] = runs
+        test_data["results"] = result
 
-                    valid, runs, result = benchmark(
-                        test_cmd, args.debug_flag, prog_bar, limit=limit
-                    )
-                    if prog_bar:  # only update is progress bar exists
-                        progress += 1
-                        prog_bar.update(progress)
-                    test_data["id"] = test["id"]
-                    test_data["type"] = command["type"]
-                    if command["type"] != "cpu":
-                        test_data["selected_gpu"] = gpu_idx
-                        test_data["selected_cpu"] = None
-                    else:
-                        test_data["selected_gpu"] = None
-                        test_data["selected_cpu"] = 0
-                    test_data["runs"] = runs
-                    test_data["results"] = result
-
-                    if len(runs) >= 1:
-                        benchmark_data.append(test_data)
+        if len(runs) >= 1:
+            benchmark_data.append(test_data)
     if prog_bar:
         prog_bar.finish()  # Ensure the progress bar properly finishes if it was used
     print("")
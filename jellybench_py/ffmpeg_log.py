@@ -1,8 +1,34 @@
+import atexit
 import os
+import threading
 
 global ffmpeg_log_path
 ffmpeg_log_path = "./ffmpeg_err_log.txt"
 
+# The log file stays open for the whole run instead of being reopened per message,
+# workers report errors from several threads at once
+_log_file = None
+_log_lock = threading.Lock()
+
+
+def _open_log(mode: str):
+    # (Re)open the shared log file, callers hold _log_lock
+    global _log_file
+    if _log_file is not None:
+        _log_file.close()
+    first_open = _log_file is None
+    _log_file = open(ffmpeg_log_path, mode, buffering=1 << 16)
+    if first_open:
+        atexit.register(lambda: _log_file.close())
+    return _log_file
+
+
+def _get_log():
+    # The shared log file, opened for appending on first use; callers hold _log_lock
+    if not ffmpeg_log_path:
+        return None
+    return _log_file if _log_file is not None else _open_log("a")
+
 
 def create_log():
     from time import ctime
@@ -15,28 +41,30 @@ def create_log():
 
     # Write the data to the file
     if ffmpeg_log_path:
-        with open(ffmpeg_log_path, "w") as ffmpeg_log_file:
-            ffmpeg_log_file.write(time_now)
+        with _log_lock:
+            _open_log("w").write(time_now)
 
 
 def set_test_header(header: str):
     # append the testfile-name to the file
-    if ffmpeg_log_path:
-        with open(ffmpeg_log_path, "a") as ffmpeg_log_file:
-            ffmpeg_log_file.write(f"{header}\n")
+    with _log_lock:
+        if log_file := _get_log():
+            log_file.write(f"{header}\n")
+            log_file.flush()  # section boundary, keep it should the run crash
 
 
 def set_test_args(arguments):
     # append the command used to the file
-    if ffmpeg_log_path:
-        with open(ffmpeg_log_path, "a") as ffmpeg_log_file:
-            ffmpeg_log_file.write(f"    -> {arguments}\n")
+    with _log_lock:
+        if log_file := _get_log():
+            log_file.write(f"    -> {arguments}\n")
 
 
 def set_test_error(errors):
     # append the command used to the file
-    if ffmpeg_log_path:
-        with open(ffmpeg_log_path, "a") as ffmpeg_log_file:
-            for line in errors.splitlines():
-                ffmpeg_log_file.write(f"        -| {line}\n")
-            ffmpeg_log_file.write("        ----\n")
+    with _log_lock:  # keep each error block together
+        if log_file := _get_log():
+            # Format the whole block first and hand it over in a single write
+            block = "".join(f"        -| {line}\n" for line in errors.splitlines())
+            log_file.write(f"{block}        ----\n")
+            log_file.flush()
@@ -20,9 +20,12 @@
 import json
 import platform
 import subprocess
+from functools import cache
 
 import cpuinfo
 
+from jellybench_py.util import exit_with_prompt
+
 if platform.system() == "Windows":
     import wmi  # type: ignore
 
@@ -50,8 +53,7 @@ def run_lshw(hardware):
         print("Error")
         print()
         print("ERROR: lshw not installed. You may install it and try again.")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
     hw_subproc = subprocess.run(
         [lshw_path, "-json", "-class", hardware],
         text=True,
@@ -212,13 +214,24 @@ def get_gpu_info() -> list:
         print("Error")
         print()
         print("ERROR: Unsupported OS, Hardware information not supported")
-        input("Press any key to exit")
-        exit()
+        exit_with_prompt()
     return gpu_elements
 
 
+@cache
+def _get_raw_cpu_info() -> dict:
+    # py-cpuinfo probes the CPU on every call, which is slow, so only do it once
+    return cpuinfo.get_cpu_info()
+
+
+def has_sha_extensions() -> bool:
+    # SHA-NI on x86, the SHA2 crypto extension on ARMv8
+    flags = _get_raw_cpu_info().get("flags", [])
+    return any(flag in flags for flag in ("sha_ni", "sha", "sha2"))
+
+
 def get_cpu_info() -> list:
-    cpu_info = cpuinfo.get_cpu_info()
+    cpu_info = _get_raw_cpu_info()
     cpu_elements = list()
 
     # This field might not exist on macOS
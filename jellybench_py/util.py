@@ -1,10 +1,15 @@
-from jellybench_py.constant import Style
+import os
+import sys
+from bisect import bisect_right
+from typing import NoReturn
 
+from jellybench_py.constant import Constants, Style
 
-def styled(text: str, styles: list[Style]) -> str:
+
+def styled(text: str, styles: list[str]) -> str:
     # Return a styled string
-    style = "".join([x.value for x in styles])
-    return f"{style}{text}{Style.RESET.value}"
+    style = "".join(styles)
+    return f"{style}{text}{Style.RESET}"
 
 
 def confirm(
@@ -28,15 +33,31 @@ def confirm(
     return valid_inputs[response]
 
 
-def get_nvenc_session_limit(driver_version: int) -> int:
-    if driver_version >= 550.0:
-        return 8
-    elif 530.0 <= driver_version < 550.0:
-        return 5
-    elif driver_version <= 530.0:
-        return 3
-    else:
-        return 0
+def exit_with_prompt(code: int = 1) -> NoReturn:
+    # Let interactive users read the error first, never block scripted runs
+    if sys.stdin.isatty():
+        input("Press any key to exit")
+    sys.exit(code)
+
+
+def preload_file(file_path: str) -> None:
+    # Ask the kernel to read a file into the page cache in the background (POSIX only)
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # only a hint, the file is loaded on first use anyway
+
+
+def get_nvenc_session_limit(driver_version: float) -> int:
+    # Binary search the sorted version thresholds for the driver's limit
+    index = bisect_right(Constants.NVENC_LIMIT_VERSIONS, driver_version)
+    return Constants.NVENC_SESSION_LIMITS[index]
 
 
 def print_debug(*string: str, prefix: str | None = "|", **kwargs):
@@ -18,141 +18,161 @@
 #
 ##########################################################################################
 
-import concurrent.futures
 import re
-import shlex
 import subprocess
+import tempfile
+from time import monotonic
 
 from jellybench_py import ffmpeg_log
 
-
-def run_ffmpeg(pid: int, ffmpeg_cmd: list) -> tuple:  # Process ID,
-    # print(f"{pid} |> Running FFMPEG Process: {pid}")
-    timeout = 120  # Stop any process that runs for more then 120sec
+# ffmpeg progress reports plus the -benchmark summary lines, matched at line starts
+_REPORT_RE = re.compile(
+    r"^(?:frame=\s*(?P<frame>\d+)\s+fps=\s*(?P<fps>[\d.]+).*?speed=\s*(?P<speed>[\d.e+-]+)x"
+    r"|bench: maxrss=\s*(?P<rss>[\d.]+)"
+    r"|bench: utime=\S+\s+stime=\S+\s+rtime=\s*(?P<rtime>[\d.]+))",
+    re.MULTILINE,
+)
+
+# Stop any process that runs for more then 120sec
+_TIMEOUT = 120
+
+# (pattern, group holding the reason) for known ffmpeg failure messages
+_FAILURE_PATTERNS = (
+    (re.compile(r" failed: (.*)\([0-9]+\)"), 1),
+    (re.compile(r" failed -> (.*): (.*)"), 2),
+    (re.compile(r"^Error (.*)"), 1),
+)
+
+
+def _start_ffmpeg(ffmpeg_cmd: list) -> tuple:
+    # stderr goes to a temporary file rather than a pipe, so no worker can stall on a
+    # full pipe buffer while nobody is reading it; stdin is closed like subprocess.run did.
+    # The workers stay in our process group, so the terminal's Ctrl+C / SIGHUP reach
+    # them directly, even while a background thread is the one waiting on them
+    stderr_file = tempfile.TemporaryFile("w+")
+    process = subprocess.Popen(
+        ffmpeg_cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,  # ffmpeg's stdout (the null muxer) is never read
+        stderr=stderr_file,
+    )
+    return process, stderr_file
+
+
+def _kill_ffmpeg(process) -> None:
+    if process.poll() is not None:
+        return  # already exited and reaped
+    process.kill()
+    process.wait()
+
+
+def _finish_ffmpeg(process, stderr_file, deadline: float) -> tuple:
     failure_reason = None
     try:
-        process_output = subprocess.run(
-            ffmpeg_cmd,
-            stdin=subprocess.PIPE,
-            capture_output=True,
-            universal_newlines=True,
-            timeout=timeout,
-        )
-        retcode = process_output.returncode
-        ffmpeg_stderr = process_output.stderr
+        retcode = process.wait(timeout=max(0.0, deadline - monotonic()))
+        stderr_file.seek(0)
+        ffmpeg_stderr = stderr_file.read()
 
     except subprocess.TimeoutExpired:
+        _kill_ffmpeg(process)
         ffmpeg_stderr = ""
         retcode = 0
         failure_reason = "failed_timeout"
 
+    finally:
+        stderr_file.close()
+
     if 0 < retcode < 255:
         ffmpeg_log.set_test_error(ffmpeg_stderr)
         failure_reason = "generic_ffmpeg_failure"
-        for line in ffmpeg_stderr:
-            if re.search(r" failed: (.*)\([0-9]+\)", ffmpeg_stderr):
-                failure_reason = (
-                    re.search(r" failed: (.*)\([0-9]+\)", ffmpeg_stderr)
-                    .group(1)
-                    .strip()
-                )
-                break
-            elif re.search(r" failed -> (.*): (.*)", ffmpeg_stderr):
-                failure_reason = (
-                    re.search(r" failed -> (.*): (.*)", ffmpeg_stderr).group(2).strip()
-                )
-                break
-            elif re.search(r" failed -> (.*): (.*)", ffmpeg_stderr):
-                failure_reason = (
-                    re.search(r" failed!: (.*) \([0-9]+\))", ffmpeg_stderr)
-                    .group(1)
-                    .strip()
-                )
-                break
-            elif re.search(r"^Error (.*)", ffmpeg_stderr):
-                failure_reason = (
-                    re.search(r"^Error (.*)", ffmpeg_stderr).group(1).strip()
-                )
+        # First pattern (in priority order) found anywhere in the output wins
+        for pattern, group in _FAILURE_PATTERNS:
+            if match := pattern.search(ffmpeg_stderr):
+                failure_reason = match.group(group).strip()
                 break
     return ffmpeg_stderr, failure_reason
 
 
-def workMan(worker_count: int, ffmpeg_cmd: str) -> tuple:
-    ffmpeg_cmd_list = shlex.split(ffmpeg_cmd)
-    raw_worker_data = {}
-    failure_reason = None
+def run_ffmpeg(pid: int, ffmpeg_cmd: list) -> tuple:  # Process ID,
+    # print(f"{pid} |> Running FFMPEG Process: {pid}")
+    process, stderr_file = _start_ffmpeg(ffmpeg_cmd)
+    return _finish_ffmpeg(process, stderr_file, monotonic() + _TIMEOUT)
+
+
+def workMan(worker_count: int, ffmpeg_cmd: list) -> tuple:
     # print(f"> Run with {worker_count} Processes")
-    with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
-        futures = {
-            executor.submit(run_ffmpeg, nr, ffmpeg_cmd_list): nr
-            for nr in range(worker_count)
-        }
-        for future in concurrent.futures.as_completed(futures):
-            pid = futures[future]
-            raw_worker_data[pid] = future.result()
-            # print(f"> > > Finished Worker Process: {pid}")
-            if raw_worker_data[pid][1]:
-                failure_reason = raw_worker_data[pid][1]
+    # Each worker already is its own ffmpeg process, start them all and then reap them
+    # in order against one shared deadline, no threads needed to wait on them
+    workers = [_start_ffmpeg(ffmpeg_cmd) for _ in range(worker_count)]
+    deadline = monotonic() + _TIMEOUT
+    try:
+        raw_worker_data = [
+            _finish_ffmpeg(process, stderr_file, deadline)
+            for process, stderr_file in workers
+        ]
+    except BaseException:
+        # Don't leave workers running behind an aborted run
+        for process, stderr_file in workers:
+            _kill_ffmpeg(process)
+            stderr_file.close()
+        raise
+    failure_reason = None
+    for _, worker_failure in raw_worker_data:
+        if worker_failure:
+            failure_reason = worker_failure
 
     if failure_reason:
         raw_worker_data = None
         # Deleting all the Raw Data, since run with failed Worker is not counted
 
-    run_data_raw = []
     if raw_worker_data:  # If no run Failed
-        for pid in range(worker_count):
-            process_output = raw_worker_data[pid][0]
-
-            framelines = []
-            rtime = 0.0
-            for line in process_output.split("\n"):
-                if re.match(r"^frame=", line):
-                    if re.match(r"frame=\s*([5-9]\d{2,}|[1-9]\d{3,})", line):
-                        new_line = re.sub(r"=\s*", "=", line)
-                        framelines.append(new_line)  # framelines (Frame>500)
-
-                if re.match(r"^bench: maxrss", line):
-                    rssline = line.split()
-                    workrss = float(
-                        rssline[1].split("=")[-1].replace("kB", "").replace("KiB", "")
-                    )  # maxrss
-
-                if re.match(r"^bench: utime", line):
-                    timeline = line.split()
-                    rtime = float(timeline[3].split("=")[-1].replace("s", ""))  # rtime
-
-            frames = []
-            speeds = []
-            framerates = 0
-            for line in framelines:
-                new_line = line.split()
-                frames.append(int(float(new_line[0].split("=")[-1])))
-                framerates += int(float(new_line[1].split("=")[-1]))
-                speeds.append(float(new_line[6].split("=")[-1].replace("x", "")))
-            lineAmmount = len(framelines)
-            if lineAmmount == 0:
-                lineAmmount = 1
-            if len(frames) == 0:
-                frames.append(1)
-
-            avgSpeed = sum(speeds) / lineAmmount
-            maxFrame = max(frames)
-            avgFPS = framerates / lineAmmount
-
-            worker_data = {
-                "frame": maxFrame,
-                "speed": avgSpeed,
-                "time_s": rtime,
-                "rss": workrss,
-                "FPS": avgFPS,
-            }
-
-            run_data_raw.append(worker_data)
+        run_data_raw = [
+            parse_worker_output(process_output) for process_output, _ in raw_worker_data
+        ]
         return False, evaluateRunData(run_data_raw)
     else:
         return True, failure_reason
 
 
+def parse_worker_output(process_output: str) -> dict:
+    # Reduce one worker's ffmpeg stderr to its frame, speed, time, rss and FPS figures
+    frames = []
+    speeds = []
+    framerates = 0
+    rtime = 0.0
+    workrss = 0.0
+    # One sweep over the whole output, only lines starting with a match count
+    for match in _REPORT_RE.finditer(process_output):
+        frame, fps, speed, rss, run_time = match.groups()
+        if frame is not None:
+            if int(frame) >= 500:  # framelines (Frame>500)
+                frames.append(int(frame))
+                framerates += int(float(fps))
+                speeds.append(float(speed))
+        elif rss is not None:
+            workrss = float(rss)  # maxrss
+        else:
+            rtime = float(run_time)  # rtime
+
+    lineAmmount = len(frames)
+    if lineAmmount == 0:
+        lineAmmount = 1
+    if len(frames) == 0:
+        frames.append(1)
+
+    avgSpeed = sum(speeds) / lineAmmount
+    maxFrame = max(frames)
+    avgFPS = framerates / lineAmmount
+
+    return {
+        "frame": maxFrame,
+        "speed": avgSpeed,
+        "time_s": rtime,
+        "rss": workrss,
+        "FPS": avgFPS,
+    }
+
+
 def evaluateRunData(run_data_raw: list) -> dict:
     workers = len(run_data_raw)
 
@@ -182,19 +202,3 @@ def evaluateRunData(run_data_raw: list) -> dict:
         "avgFPS": avgFPS,
     }
     return run_data_eval
-
-
-def test_command(ffmpeg_cmd):
-    ffmpeg_cmd_list = shlex.split(ffmpeg_cmd)
-    successful_stream_count = 0
-    raw_worker_data = run_ffmpeg(1, ffmpeg_cmd_list)
-
-    failure_reason = raw_worker_data[1]
-    process_output = raw_worker_data[0]
-    nvenc_limit_reasons = ["incompatible client key", "out of memory"]
-    if failure_reason in nvenc_limit_reasons or failure_reason is None:
-        success_pattern = r"Output #\d+, null, to 'pipe:'"
-        successful_streams = re.findall(success_pattern, process_output)
-        successful_stream_count = len(successful_streams)
-
-    return successful_stream_count, failure_reason